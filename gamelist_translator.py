@@ -7,16 +7,36 @@ import os
 import re
 import sys
 from pathlib import Path
-from xml.etree import ElementTree as ET
+from xml.sax.saxutils import quoteattr
+
+# lxml parses/serializes multi-MB gamelists roughly an order of magnitude
+# faster than stdlib ElementTree; fall back if it is not installed
+try:
+    from lxml import etree as ET
+except ImportError:
+    from xml.etree import ElementTree as ET
+
+# pandas gives a vectorized CSV-load path (one C loop per column instead of
+# Python per row); the stdlib csv loop below remains the fallback
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+# pre-compiled once: strip_region_suffix runs per CSV row and per game.
+# single alternation covering both region/platform and language tags so one
+# pass over the string replaces the previous two
+_SUFFIX_RE = re.compile(r'\s*\([^)]*(?:USA|Japan|Europe|China|Korea|Australia|Canada|PAL|NTSC|Asia|Brazil|Mexico|France|Germany|Italy|Spain|UK|Region|Rev|Disc|CD|En|Fr|De|Es|It)[^)]*\)\s*', re.I)
 
 
 def strip_region_suffix(name: str) -> str:
     """Strip region suffixes like (USA), (Japan), etc. from game names"""
-    # Remove region/platform info in parentheses at the end
-    name = re.sub(r'\s*\([^)]*(?:USA|Japan|Europe|China|Korea|Australia|Canada|PAL|NTSC|Asia|Brazil|Mexico|France|Germany|Italy|Spain|UK|Region|Rev|Disc|CD)[^)]*\)\s*', '', name, flags=re.I)
-    # Also remove language info in parentheses  
-    name = re.sub(r'\s*\([^)]*(?:En|Fr|De|Es|It)[^)]*\)\s*', '', name, flags=re.I)
-    return name.strip()
+    # fast path: the pattern only ever matches parenthesized groups, so most
+    # names (no parens at all) skip the regex engine entirely
+    if '(' not in name:
+        return name.strip()
+    return _SUFFIX_RE.sub('', name).strip()
 
 
 def load_all_csvs(csv_dir: str) -> dict:
@@ -33,23 +53,55 @@ def load_all_csvs(csv_dir: str) -> dict:
     
     for csv_file in sorted(csv_path.glob("*.csv")):
         try:
-            with open(csv_file, "r", encoding="utf-8-sig", newline="") as f:
-                reader = csv.DictReader(f)
-                if not reader.fieldnames:
+            if pd is not None:
+                # index_col=False keeps pandas from promoting leading fields
+                # of over-long rows to the index and shifting the columns;
+                # on any parse error fall through to the tolerant row-by-row
+                # loader below
+                try:
+                    df = pd.read_csv(csv_file, encoding="utf-8-sig", dtype=str, keep_default_na=False, index_col=False)
+                    keys = {c.strip().lower(): c for c in df.columns}
+                    en_col = keys.get("name en")
+                    cn_col = keys.get("name cn")
+                    if not en_col or not cn_col:
+                        continue
+                    en = df[en_col].str.strip()
+                    cn = df[cn_col].str.strip()
+                    mask = (en != "") & (cn != "")
+                    en_stripped = en[mask].str.replace(_SUFFIX_RE, "", regex=True).str.strip()
+                    # reversed so the first occurrence wins, matching the
+                    # row-by-row fallback's "don't overwrite" semantics
+                    pairs = dict(zip(en_stripped[::-1], cn[mask][::-1]))
+                    for k, v in pairs.items():
+                        if k:
+                            en_to_cn.setdefault(k, v)
                     continue
-                
-                # Find the EN and CN column names (case-insensitive)
-                keys = {k.strip().lower(): k for k in reader.fieldnames}
-                en_col = keys.get("name en")
-                cn_col = keys.get("name cn")
-                
-                if not en_col or not cn_col:
+                except Exception:
+                    pass
+
+            # csv.reader + positional indexing avoids DictReader's per-row
+            # dict build; the larger buffer helps when scanning 30+ files
+            with open(csv_file, "r", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if not header:
+                    continue
+
+                # Find the EN and CN column indices (case-insensitive)
+                keys = {h.strip().lower(): i for i, h in enumerate(header)}
+                en_idx = keys.get("name en")
+                cn_idx = keys.get("name cn")
+
+                if en_idx is None or cn_idx is None:
                     continue
-                
+                need = max(en_idx, cn_idx) + 1
+
                 for row in reader:
-                    en = (row.get(en_col) or "").strip()
-                    cn = (row.get(cn_col) or "").strip()
-                    
+                    if len(row) < need:
+                        continue
+                    en = row[en_idx].strip()
+                    cn = row[cn_idx].strip()
+
                     # Only store if both EN and CN are non-empty
                     if en and cn:
                         # Strip region suffix from EN name
@@ -57,7 +109,7 @@ def load_all_csvs(csv_dir: str) -> dict:
                         # Store the mapping if not already present
                         if en_stripped and en_stripped not in en_to_cn:
                             en_to_cn[en_stripped] = cn
-                        
+
         except Exception as e:
             print(f"[WARN] Error loading {csv_file}: {e}", file=sys.stderr)
     
@@ -136,14 +188,18 @@ def main():
     # Write output
     print(f"[INFO] Writing {args.output}...", file=sys.stderr)
     try:
-        # Handle wrapping: if we wrapped it, extract just gameList
-        if root.tag == 'root':
-            output_tree = gamelist
-            tree = ET.ElementTree(output_tree)
-        else:
-            tree = ET.ElementTree(root)
-        
-        tree.write(args.output, encoding='utf-8', xml_declaration=True, default_namespace=None)
+        # Stream one <game> at a time instead of materializing the whole
+        # serialized document in memory (gamelists reach tens of MB)
+        # serialize the real root tag (attributes and leading text included)
+        # rather than a hardcoded <gameList> that would drop them
+        attrs = ''.join(f' {k}={quoteattr(v)}' for k, v in gamelist.attrib.items())
+        with open(args.output, 'wb', buffering=1 << 20) as f:
+            f.write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+            f.write(f'<{gamelist.tag}{attrs}>'.encode('utf-8'))
+            f.write((gamelist.text or '\n').encode('utf-8'))
+            for child in gamelist:
+                f.write(ET.tostring(child, encoding='unicode').encode('utf-8'))
+            f.write(f'</{gamelist.tag}>\n'.encode('utf-8'))
         print(f"[INFO] Translated {translated_count} game names", file=sys.stderr)
         print(f"[INFO] Saved to {args.output}", file=sys.stderr)
         return 0
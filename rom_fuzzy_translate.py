@@ -1,31 +1,59 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import argparse, csv, json, os, re, sys
-from xml.sax.saxutils import escape as xesc
+import argparse, csv, functools, json, os, re, sys
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from rapidfuzz import fuzz, process
 import seq_utils
 
+# lxml serializes large gamelists faster; stdlib ElementTree works fine too
+try:
+    from lxml import etree as ET
+except ImportError:
+    from xml.etree import ElementTree as ET
+
+# orjson parses the alias file a few times faster; stdlib json works fine too
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # normalize common fullwidth punctuation to ASCII
 FW_MAP = {ord('，'): ',', ord('！'): '!', ord('？'): '?', ord('（'): '(', ord('）'): ')',
           ord('：'): ':', ord('；'): ';', ord('【'): '[', ord('】'): ']', ord('、'): ',',
           ord('—'): '-', ord('－'): '-', ord('～'): '~', ord('　'): ' '}
 
-PUNCT = FW_MAP
-
-
+# complete fullwidth->ASCII table so norm() remaps everything in a single
+# C-level str.translate pass: the curated punctuation above, the whole
+# FF01..FF5E fullwidth-ASCII block (offset by 0xFEE0), and ideographic space
+FULL_TABLE = {cp: cp - 0xFEE0 for cp in range(0xFF01, 0xFF5F)}
+FULL_TABLE.update(FW_MAP)
+FULL_TABLE[0x3000] = ord(' ')
+
+# pre-compiled patterns; norm/parse_ls run once per candidate and per ROM,
+# so avoid re-interpolating and re-looking-up patterns on every call
+_META = r"(\u7B80\u4F53|\u7E41\u4F53|\u4E2D\u6587|\u6C49\u5316|\u82F1\u5316|\u7834\u89E3\u7248|\u4FEE\u6B63\u7248|\u4FEE\u590D|\u8865\u4E01|\u6574\u5408|\u5408\u96C6|\u5178\u85CF|\u5B8C\u5168\u7248|\u5E74\u5EA6\u7248|\u8C6A\u534E\u7248|v\d|ver\.?\d|beta|demo)"
+_META_PAREN_RE = re.compile(rf"\((?=[^)]*{_META})[^)]*\)", re.I)
+_META_BRACKET_RE = re.compile(rf"\[(?=[^\]]*{_META})[^\]]*\]", re.I)
+# bare alternation (no lookahead/group machinery) used as a cheap gate:
+# most titles carry no meta tag, so one fast scan skips both subs above
+_META_HIT_RE = re.compile(_META, re.I)
+_WS_RE = re.compile(r"\s+")
+_LS_SPLIT_RE = re.compile(r"\s{2,}")
+_CN_CHAR_RE = re.compile(r"[\u4E00-\u9FFF]")
+
+
+@functools.lru_cache(maxsize=None)
 def norm(s: str) -> str:
-    # map fullwidth punctuation and collapse spaces
-    s = s.translate(PUNCT)
-    s = re.sub(r"[\uFF01-\uFF60\u3000]", lambda m: FW_MAP.get(ord(m.group(0)), m.group(0)), s)
-    s = s.replace('\u3000', ' ')
-    s = re.sub(r"\s+", " ", s.strip())
-    meta = r"(简体|繁体|中文|汉化|英化|破解版|修正版|修复|补丁|整合|合集|典藏|完全版|年度版|豪华版|v\d|ver\.?\d|beta|demo)"
-    s = re.sub(rf"\((?=[^)]*{meta})[^)]*\)", "", s, flags=re.I)
-    s = re.sub(rf"\[(?=[^\]]*{meta})[^\]]*\]", "", s, flags=re.I)
-    # strip surrounding quotes and punctuation
-    s = s.strip(' "\'`')
-    s = re.sub(r"\s+", " ", s).strip()
+    # map fullwidth punctuation and collapse spaces; memoized since the same
+    # titles recur across candidate lists and duplicate ROM stems
+    s = s.translate(FULL_TABLE)
+    if ('(' in s or '[' in s) and _META_HIT_RE.search(s):
+        s = _META_PAREN_RE.sub("", s)
+        s = _META_BRACKET_RE.sub("", s)
+    # single whitespace collapse, then strip surrounding quotes/spaces
+    s = _WS_RE.sub(" ", s).strip(' "\'`')
     return s
 
 
@@ -35,8 +63,9 @@ def load_aliases(csv_dir: str) -> dict:
     if not os.path.isfile(path):
         return {}
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(path, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     except Exception:
         return {}
     amap = {}
@@ -55,49 +84,75 @@ def load_aliases(csv_dir: str) -> dict:
     return amap
 
 
+# one alternation over all alias keys (longest first so the most specific
+# alias wins), compiled once per alias map: a single C-level scan replaces
+# the old O(aliases) Python substring loop per query
+_alias_re_cache: dict = {}
+
+
+def _alias_re(amap: dict):
+    pat = _alias_re_cache.get(id(amap))
+    if pat is None:
+        keys = sorted(amap, key=len, reverse=True)
+        pat = re.compile("|".join(re.escape(k) for k in keys), re.I)
+        _alias_re_cache[id(amap)] = pat
+    return pat
+
+
 def apply_alias(s: str, amap: dict) -> str:
     if not amap:
         return s
     ln = s.lower()
     if ln in amap:
         return amap[ln]
-    # replace alias substring in original string (preserve non-matched case)
-    for a_norm, can in amap.items():
-        if a_norm in ln:
-            return re.sub(re.escape(a_norm), can, s, flags=re.I)
-    return s
+    # replace alias substrings in the original string (keys are normalized
+    # lowercase, so the match lowercased is the lookup key)
+    return _alias_re(amap).sub(lambda m: amap.get(m.group(0).lower(), m.group(0)), s)
 
 
 # sequence helpers are provided by seq_utils; enabled via `--seq` flag.
 
 
+def _stem(rf: str) -> str:
+    # rfind-based splitext: avoids the tuple alloc and path-rule dispatch of
+    # os.path.splitext per ROM. Only strips a trailing dot-segment of <= 7
+    # chars, which covers every ROM extension (.iso, .cso, .chd, .7z, ...)
+    i = rf.rfind('.')
+    return rf[:i] if i > 0 and len(rf) - i <= 8 else rf
+
+
 def read_lines(path: str):
+    # generator: peak memory stays at one line + read buffer regardless of
+    # list size; parse_ls consumes it lazily
     if path == "-":
-        return sys.stdin.read().splitlines()
-    return open(path, "r", encoding="utf-8").read().splitlines()
+        yield from sys.stdin
+        return
+    with open(path, "r", encoding="utf-8", buffering=1 << 20) as f:
+        yield from f
 
 
 def parse_ls(lines):
-    out = []
-    for ln in lines:
-        ln = ln.strip()
-        if ln:
-            out += [p for p in re.split(r"\s{2,}", ln) if p]
-    return out
+    # one comprehension, no per-line list concatenation
+    return [p for ln in lines if (s := ln.strip()) for p in _LS_SPLIT_RE.split(s) if p]
 
 
 def load_csv(csv_path):
-    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
-        r = csv.DictReader(f)
-        keys = {k.strip().lower(): k for k in (r.fieldnames or [])}
-        en_k = keys.get("name en")
-        cn_k = keys.get("name cn")
-        if not en_k or not cn_k:
-            raise ValueError(f"Bad CSV headers: {r.fieldnames}")
+    # csv.reader + positional indexing avoids DictReader's per-row dict build
+    with open(csv_path, "r", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
+        r = csv.reader(f)
+        header = next(r, None) or []
+        keys = {h.strip().lower(): i for i, h in enumerate(header)}
+        en_i = keys.get("name en")
+        cn_i = keys.get("name cn")
+        if en_i is None or cn_i is None:
+            raise ValueError(f"Bad CSV headers: {header}")
+        need = max(en_i, cn_i) + 1
         cn_list, cn2en = [], {}
         for row in r:
-            en = (row.get(en_k) or "").strip()
-            cn = (row.get(cn_k) or "").strip()
+            if len(row) < need:
+                continue
+            en = row[en_i].strip()
+            cn = row[cn_i].strip()
             if cn and en and cn not in cn2en:
                 cn2en[cn] = en
                 cn_list.append(cn)
@@ -133,11 +188,19 @@ def ask_choice(rf, score, stem_cn, csv_cn, csv_en, remaining: int):
     return stem_cn
 
 
-def top_candidates(query_raw: str, query_norm: str, cn_norm: list[str], cn_list: list[str], cn2en: dict, limit: int = 6):
-    # return list of (csv_cn, csv_en, score) sorted desc
+def top_candidates(row, cn_norm: list[str], cn_list: list[str], cn2en: dict, limit: int = 6):
+    # return list of (csv_cn, csv_en, score, cand_norm) sorted desc from a cdist score row
+    limit = min(limit, len(row))
+    # argpartition gets the top-k without a full sort; only the k slice is
+    # sorted after (negate as signed so the uint8 scores don't wrap).
+    # lexsort breaks score ties by candidate index so the listing order is
+    # deterministic, not whatever order argpartition happened to emit
+    neg = -row.astype(np.int16)
+    top = np.argpartition(neg, limit - 1)[:limit]
+    top = top[np.lexsort((top, neg[top]))]
     return [
-        (cn_list[int(idx)], cn2en.get(cn_list[int(idx)], ''), int(score), cand_norm)
-        for cand_norm, score, idx in process.extract(query_norm, cn_norm, scorer=fuzz.WRatio, limit=limit)
+        (cn_list[int(idx)], cn2en.get(cn_list[int(idx)], ''), int(row[idx]), cn_norm[int(idx)])
+        for idx in top
     ]
 
 
@@ -174,33 +237,89 @@ def ask_choice_multi(rf: str, query_raw: str, candidates: list, remaining: int):
     return None
 
 
-def best_match(query_raw: str, query_norm: str, cn_norm: list[str]) -> tuple[int, int]:
+def prefilter_scores(queries_norm: list[str], cn_norm: list[str], min_jaccard: float = 0.2, score_cutoff: int = 0):
     """
-    Return (idx in cn_norm/cn_list, score). Uses better scorer + deterministic tie-breaks:
+    Same shape as the cdist matrix, but each query only scores candidates
+    passing a cheap bigram-set Jaccard filter; obviously-unrelated candidates
+    keep score 0 without ever entering WRatio. Candidates are gathered via a
+    bigram -> candidate-ids inverted index: any candidate sharing a bigram
+    with the query is exactly the set with non-zero Jaccard intersection, so
+    the gather loses nothing the Jaccard test could accept and per-query
+    cost scales with postings hit, not the full candidate count. Falls back
+    to a full scan for a query when nothing passes the filter.
+    """
+    cand_bigrams = [frozenset(zip(c, c[1:])) for c in cn_norm]
+    bigram_index: dict = {}
+    for ci, bg in enumerate(cand_bigrams):
+        for b in bg:
+            bigram_index.setdefault(b, []).append(ci)
+    scores = np.zeros((len(queries_norm), len(cn_norm)), dtype=np.uint8)
+
+    def _score_one(q: str):
+        q_bi = frozenset(zip(q, q[1:]))
+        keep = []
+        if q_bi:
+            hit: set = set()
+            for b in q_bi:
+                hit.update(bigram_index.get(b, ()))
+            for ci in hit:
+                cb = cand_bigrams[ci]
+                inter = len(q_bi & cb)
+                if inter / (len(q_bi) + len(cb) - inter) >= min_jaccard:
+                    keep.append(ci)
+            keep.sort()
+        if not keep:
+            # filter miss: score everything rather than silently dropping
+            keep = list(range(len(cn_norm)))
+        row = process.cdist([q], [cn_norm[ci] for ci in keep], scorer=fuzz.WRatio, processor=None, score_cutoff=score_cutoff, dtype=np.uint8)[0]
+        return keep, row
+
+    # each query is independent and rapidfuzz releases the GIL in C, so a
+    # thread pool scales the per-query loop across cores without pickling
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for qi, (keep, row) in enumerate(ex.map(_score_one, queries_norm, chunksize=64)):
+            scores[qi, keep] = row
+    return scores
+
+
+def best_match(row, query_raw: str, query_norm: str, cn_norm: list[str], cn_dmasks: list, cn_lens) -> tuple[int, int]:
+    """
+    Return (idx in cn_norm/cn_list, score) from a cdist score row.
+    Deterministic tie-breaks among max-score candidates:
       1) exact normalized match
       2) digit-set equality when query has digits (e.g. 2 vs none)
       3) longer candidate (more specific) wins
+    cn_dmasks/cn_lens hold the precomputed digit bitmasks and lengths of each
+    candidate; the tie-break packs the criteria into one integer key per
+    tied candidate and argmaxes, instead of tuple-comparing in Python.
     """
-    top = process.extract(query_norm, cn_norm, scorer=fuzz.WRatio, limit=8)
-    if not top:
+    if len(row) == 0:
         return -1, 0
 
-    best_score = int(top[0][1])
-    tied = [t for t in top if int(t[1]) == best_score]
-
-    qd = digits_set(query_raw)
-
-    def key(t):
-        cand_norm, _score, idx = t
-        cd = digits_set(cand_norm)
-        exact = (cand_norm == query_norm)
-        digit_ok = (qd == cd) if qd else True
+    best_score = int(row.max())
+    if best_score == 0:
+        # everything pruned by the score cutoff (or genuinely unrelated):
+        # no point tie-breaking across the whole candidate list
+        return -1, 0
+    tied = np.flatnonzero(row == best_score)
+    if len(tied) == 1:
+        # unique max: no tie to break
+        return int(tied[0]), best_score
+
+    qd = digits_mask(query_raw)
+    n = len(tied)
+    exact = np.fromiter((cn_norm[i] == query_norm for i in tied), dtype=np.int64, count=n)
+    if qd:
+        digit_ok = np.fromiter((cn_dmasks[i] == qd for i in tied), dtype=np.int64, count=n)
         # prefer candidates whose seq tokens intersect with query
-        digit_intersect = 1 if (qd and cd and qd & cd) else 0
-        return (exact, digit_ok, digit_intersect, len(cand_norm))
-
-    best = max(tied, key=key)
-    return int(best[2]), int(best[1])
+        digit_int = np.fromiter((bool(qd & cn_dmasks[i]) for i in tied), dtype=np.int64, count=n)
+    else:
+        digit_ok = np.ones(n, dtype=np.int64)
+        digit_int = np.zeros(n, dtype=np.int64)
+    # same lexicographic order as the old (exact, digit_ok, digit_int, len)
+    # tuple; argmax returns the first maximum, matching max() on ties
+    keys = ((((exact << 1) | digit_ok) << 1 | digit_int) << 32) | cn_lens[tied]
+    return int(tied[int(np.argmax(keys))]), best_score
 
 
 def main():
@@ -210,6 +329,8 @@ def main():
     ap.add_argument("--rom-list", default="-")
     ap.add_argument("--th", type=int, default=90)
     ap.add_argument("--seq", action="store_true", help="enable sequel/number normalization and prioritization (adhoc)")
+    ap.add_argument("--prefilter", action="store_true", help="prune candidates with a bigram-overlap filter before fuzzy scoring (adhoc)")
+    ap.add_argument("--cache", default=None, help="JSON file persisting stem->choice across runs; invalidated when the CSV changes")
     args = ap.parse_args()
 
     csv_path = os.path.join(args.csv_dir, f"{args.system}.csv")
@@ -221,15 +342,47 @@ def main():
     alias_map = load_aliases(args.csv_dir)
     # normalized candidate names (with alias and seq normalization)
     cn_norm = [norm(c) for c in cn_list]
-    global digits_set
+    global digits_mask
     if args.seq:
         # use sequence-normalized candidate list
-        cn_norm_seq = [seq_normalize(apply_alias(norm(c), alias_map)).lower() for c in cn_list]
-        # enable digits_set implementation from seq_utils
-        digits_set = seq_utils.extract_seq_tokens
+        cn_norm_seq = [seq_normalize(apply_alias(n, alias_map)).lower() for n in cn_norm]
+        # enable digits_mask implementation from seq_utils
+        digits_mask = seq_utils.seq_token_mask
     else:
-        cn_norm_seq = [apply_alias(norm(c), alias_map).lower() for c in cn_list]
-        digits_set = lambda s: set()
+        cn_norm_seq = [apply_alias(n, alias_map).lower() for n in cn_norm]
+        digits_mask = lambda s: 0
+    # drop candidates that collapse to the same normalized form (they would
+    # score identically, first one wins) and intern the survivors so the
+    # tie-break's equality checks are pointer compares; this also shrinks
+    # every score row by the duplicate count
+    seen = set()
+    dedup_list, dedup_norm = [], []
+    for c, n in zip(cn_list, cn_norm_seq):
+        if n in seen:
+            continue
+        seen.add(n)
+        dedup_list.append(c)
+        dedup_norm.append(sys.intern(n))
+    cn_list, cn_norm_seq = dedup_list, dedup_norm
+
+    # per-candidate digit bitmasks and lengths, computed once for the whole run
+    cn_dmasks = [digits_mask(s) for s in cn_norm_seq]
+    cn_lens = np.array([len(s) for s in cn_norm_seq], dtype=np.int64)
+    # exact-normalized-match index (first occurrence wins) so stems already
+    # covered by the CSV bypass fuzzy scoring entirely
+    norm_to_idx = {}
+    for i, s in enumerate(cn_norm_seq):
+        norm_to_idx.setdefault(s, i)
+
+    # optional persistent cache of previous choices; results are
+    # deterministic given (csv, stem), so key on CSV mtime + normalized stem
+    cache, cache_prefix = {}, f"{os.path.getmtime(csv_path):.0f}:"
+    if args.cache and os.path.isfile(args.cache):
+        try:
+            with open(args.cache, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except Exception:
+            cache = {}
 
     roms = parse_ls(read_lines(args.rom_list))
     if not roms:
@@ -241,23 +394,79 @@ def main():
     results = []
     pending_idx = []
 
-    for rf in roms:
-        stem = os.path.splitext(rf)[0] or rf
+    # First pass: batch-normalize everything up front (plain comprehensions,
+    # all lookups local), then partition; the Chinese queries feed a single
+    # cdist call that scores everything in rapidfuzz's C layer instead of
+    # re-entering process.extract once per ROM.
+    stems = [_stem(rf) for rf in roms]
+    stems_n_seq = [
+        seq_normalize(apply_alias(norm(stem), alias_map)).lower() if _CN_CHAR_RE.search(stem) else None
+        for stem in stems
+    ]
 
+    queries = []  # (result idx, stem, stem_n_seq)
+    for rf, stem, stem_n_seq in zip(roms, stems, stems_n_seq):
         # if the title contains no Chinese characters at all, treat it as
         # already English and skip the fuzzy matching logic.  Write the
         # original name straight to the XML and count it in statistics.
-        if not re.search(r"[\u4e00-\u9fff]", stem):
+        if stem_n_seq is None:
             non_cn += 1
             auto_ok += 1  # count toward auto-handled titles
             results.append({"rf": rf, "stem": stem, "csv_cn": "", "csv_en": "", "score": 0, "chosen": stem, "non_cn": True})
             continue
 
-        stem_n = norm(stem)
-        stem_n_alias = apply_alias(stem_n, alias_map)
-        stem_n_seq = seq_normalize(stem_n_alias).lower()
+        cached = cache.get(cache_prefix + stem_n_seq)
+        if cached is not None:
+            # previous run (same CSV) already resolved this stem
+            auto_ok += 1
+            results.append({"rf": rf, "stem": stem, "qn": stem_n_seq, "csv_cn": "", "csv_en": cached, "score": 0, "chosen": cached})
+            continue
+
+        exact_i = norm_to_idx.get(stem_n_seq)
+        if exact_i is not None:
+            csv_cn = cn_list[exact_i]
+            auto_ok += 1
+            results.append({"rf": rf, "stem": stem, "qn": stem_n_seq, "csv_cn": csv_cn, "csv_en": cn2en.get(csv_cn, ""), "score": 100, "chosen": cn2en.get(csv_cn, "") or stem})
+            continue
 
-        idx, score = best_match(stem, stem_n_seq, cn_norm_seq)
+        results.append({"rf": rf, "stem": stem, "qn": stem_n_seq, "csv_cn": "", "csv_en": "", "score": 0, "chosen": None})
+        queries.append((len(results) - 1, stem, stem_n_seq))
+
+    if queries:
+        queries_norm = [q[2] for q in queries]
+        # region variants often collapse to the same normalized stem: score
+        # each unique form once and share its row among duplicates
+        uniq_norm = list(dict.fromkeys(queries_norm))
+        # anything scoring well below the accept threshold is junk even for
+        # the review list, so let rapidfuzz early-exit those pairs in C
+        cutoff = max(0, args.th - 20)
+        if args.prefilter:
+            uniq_scores = prefilter_scores(uniq_norm, cn_norm_seq, score_cutoff=cutoff)
+        else:
+            # both sides are already canonicalized by norm(), so no
+            # per-pair preprocessing inside the scorer
+            uniq_scores = process.cdist(
+                uniq_norm, cn_norm_seq,
+                scorer=fuzz.WRatio, processor=None, score_cutoff=cutoff,
+                workers=-1, dtype=np.uint8,
+            )
+        row_of = {qn: uniq_scores[i] for i, qn in enumerate(uniq_norm)}
+        scores = [row_of[qn] for qn in queries_norm]
+    else:
+        scores = []
+
+    for row, (ridx, stem, stem_n_seq) in zip(scores, queries):
+        rec = results[ridx]
+        idx, score = best_match(row, stem, stem_n_seq, cn_norm_seq, cn_dmasks, cn_lens)
+        if (idx < 0 or score < args.th) and cutoff > 0:
+            # the batch cutoff zeroed sub-cutoff scores; re-score just this
+            # row without it so review shows real scores and a best match
+            # below the cutoff still reaches the reviewer
+            row = process.cdist(
+                [stem_n_seq], cn_norm_seq,
+                scorer=fuzz.WRatio, processor=None, dtype=np.uint8,
+            )[0]
+            idx, score = best_match(row, stem, stem_n_seq, cn_norm_seq, cn_dmasks, cn_lens)
         if idx >= 0:
             csv_cn = cn_list[idx]
             csv_en = cn2en.get(csv_cn, "")
@@ -266,19 +475,19 @@ def main():
 
         if not csv_en:
             # no CSV mapping available
-            results.append({"rf": rf, "stem": stem, "csv_cn": "", "csv_en": "", "score": 0, "chosen": stem})
+            rec["chosen"] = stem
         elif score >= args.th:
             # auto-accepted
             auto_ok += 1
-            results.append({"rf": rf, "stem": stem, "csv_cn": csv_cn, "csv_en": csv_en, "score": score, "chosen": csv_en})
+            rec.update({"csv_cn": csv_cn, "csv_en": csv_en, "score": score, "chosen": csv_en})
         else:
             prompted += 1
-            cands = top_candidates(stem, stem_n_seq, cn_norm_seq, cn_list, cn2en, limit=6)
+            cands = top_candidates(row, cn_norm_seq, cn_list, cn2en, limit=6)
             # record top candidate as detected CN/EN
             top_cn = cands[0][0] if cands else ""
             top_en = cands[0][1] if cands else ""
-            results.append({"rf": rf, "stem": stem, "csv_cn": top_cn, "csv_en": top_en, "score": score, "candidates": cands, "chosen": None})
-            pending_idx.append(len(results)-1)
+            rec.update({"csv_cn": top_cn, "csv_en": top_en, "score": score, "candidates": cands})
+            pending_idx.append(ridx)
 
     # Second pass: interactive review of pending low-confidence matches
     if pending_idx:
@@ -305,6 +514,19 @@ def main():
                     rec["chosen"] = disp
             results[ridx] = rec
 
+    # Persist resolved choices (auto-accepted and human-reviewed alike) so
+    # re-runs against the same CSV skip straight to the answer
+    if args.cache:
+        for rec in results:
+            qn = rec.get("qn")
+            if qn and rec.get("chosen"):
+                cache[cache_prefix + qn] = rec["chosen"]
+        try:
+            with open(args.cache, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"[WARN] failed to write cache {args.cache}: {e}", file=sys.stderr)
+
     # Print condensed mapping lines for LLM review, prefixed by a short prompt
     print("Mappings (copy-paste below to LLM for double check):\n", file=sys.stderr)
     print("This is output from a ROM name fuzzy matching program that takes Chinese ROM names and attempt to match them against a database of official Chinese names & English names. Each line is of format <original name> -> <CN detected name> -> <EN detected name>, please help double check each line below and report possible mistake in detection, if any. I only care if the game is the same one, so matching to different region version, different language is all ok. The system is %s.\n" % args.system, file=sys.stderr)
@@ -320,20 +542,22 @@ def main():
             #line: <filename> -> <CN detected name> -> <EN detected name or chosen>
             print(f"{fn} -> {detected_cn} -> {chosen}", file=sys.stderr)
 
-    # Write XML to hard-coded file
-    out = ['<?xml version="1.0"?>', "<gameList>"]
+    # Write XML to hard-coded file; the element tree handles escaping and
+    # serializes in one go instead of joining hand-built string fragments
+    root = ET.Element("gameList")
     for rec in results:
         rf = rec.get("rf")
         name = rec.get("chosen") or rec.get("stem")
-        out.append("  <game>")
-        out.append(f"    <path>{xesc('./' + rf)}</path>")
+        game = ET.SubElement(root, "game")
+        ET.SubElement(game, "path").text = './' + rf
         # omit <name> if we fell back to raw filename (no match)
         if name and name != rec.get("stem"):
-            out.append(f"    <name>{xesc(name)}</name>")
-        out.append("  </game>")
-    out.append("</gameList>\n")
-    with open('./gamelist_generated.xml', 'w', encoding='utf-8') as fh:
-        fh.write("\n".join(out))
+            ET.SubElement(game, "name").text = name
+    ET.indent(root, space="  ")
+    # encode once and hand the kernel a single write
+    payload = b'<?xml version="1.0"?>\n' + ET.tostring(root, encoding='unicode').encode('utf-8') + b'\n'
+    with open('./gamelist_generated.xml', 'wb') as fh:
+        fh.write(payload)
 
     pct = lambda x: f"{x*100/total:.1f}%" if total else "0.0%"
     print(
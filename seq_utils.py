@@ -7,12 +7,34 @@ converting Chinese/Roman numerals, and performing sequence-aware
 normalization. Keep heuristics here so they can be enabled/disabled
 from the main script.
 """
+import functools
 import re
 
 _CN_NUM_MAP = {'零':0,'一':1,'二':2,'两':2,'三':3,'四':4,'五':5,'六':6,'七':7,'八':8,'九':9,'十':10}
 
+# low-byte-indexed table: the twelve numeral codepoints all have distinct
+# low bytes, so ord(c) & 0xFF indexes a flat 256-byte table (value + 1,
+# 0 meaning absent) instead of hashing into the dict. Any other codepoint
+# can alias a live slot, so _CN_CHARS keeps the expected char per slot
+# and the lookup confirms the match with one compare.
+_CN_TABLE = bytearray(256)
+_CN_CHARS = [''] * 256
+for _ch, _v in _CN_NUM_MAP.items():
+    _CN_TABLE[ord(_ch) & 0xFF] = _v + 1
+    _CN_CHARS[ord(_ch) & 0xFF] = _ch
+_CN_TABLE = bytes(_CN_TABLE)
+_CN_CHARS = tuple(_CN_CHARS)
 
-def chinese_numeral_to_int(token: str):
+
+def _cn_digit(tok: str) -> int:
+    # value + 1 for a single known numeral char, 0 otherwise
+    if len(tok) != 1:
+        return 0
+    i = ord(tok) & 0xFF
+    return _CN_TABLE[i] if _CN_CHARS[i] == tok else 0
+
+
+def chinese_numeral_to_int(token: str) -> int | None:
     token = token.strip()
     if not token:
         return None
@@ -28,51 +50,68 @@ def chinese_numeral_to_int(token: str):
         if left == '':
             total += 10
         else:
-            total += _CN_NUM_MAP.get(left, 0) * 10
+            d = _cn_digit(left)
+            total += (d - 1) * 10 if d else 0
         if right:
-            total += _CN_NUM_MAP.get(right, 0)
+            d = _cn_digit(right)
+            total += d - 1 if d else 0
         return total
-    if len(token) == 1 and token in _CN_NUM_MAP:
-        return _CN_NUM_MAP[token]
+    d = _cn_digit(token)
+    if len(token) == 1 and d:
+        return d - 1
     return None
 
 
 _ROMAN_MAP = {'I':1,'II':2,'III':3,'IV':4,'V':5,'VI':6,'VII':7,'VIII':8,'IX':9,'X':10}
 
+# pre-compiled once; these run per candidate and per tie-break.
+# Chinese and Roman numerals share one alternation (named groups dispatch
+# the converter) so each string is walked once, not twice
+_ARABIC_RE = re.compile(r"\d{1,2}")
+_SEQ_RE = re.compile(r"(?P<cn>[一二两三四五六七八九十]{1,3})|(?P<rom>\b(?:I|II|III|IV|V|VI|VII|VIII|IX|X)\b)", re.I)
+
+
+def _seq_token_to_int(m: re.Match) -> int | None:
+    if m.lastgroup == 'cn':
+        return chinese_numeral_to_int(m.group(0))
+    return roman_to_int(m.group(0))
 
-def roman_to_int(token: str):
+
+def roman_to_int(token: str) -> int | None:
     t = token.upper()
     return _ROMAN_MAP.get(t)
 
 
-def extract_seq_tokens(s: str):
+@functools.lru_cache(maxsize=4096)
+def extract_seq_tokens(s: str) -> frozenset[str]:
+    # memoized: the tie-break asks for the same query/candidate tokens many
+    # times per run; frozenset so cached values are safely shared
     out = set()
-    for m in re.findall(r"\d{1,2}", s):
+    for m in _ARABIC_RE.findall(s):
         v = int(m)
         if 1 <= v <= 99:
             out.add(str(v))
-    for m in re.findall(r"[一二两三四五六七八九十]{1,3}", s):
-        v = chinese_numeral_to_int(m)
-        if v and 1 <= v <= 99:
-            out.add(str(v))
-    for m in re.findall(r"\b(?:I|II|III|IV|V|VI|VII|VIII|IX|X)\b", s, flags=re.I):
-        v = roman_to_int(m)
+    for m in _SEQ_RE.finditer(s):
+        v = _seq_token_to_int(m)
         if v and 1 <= v <= 99:
             out.add(str(v))
-    return out
+    return frozenset(out)
 
 
-def seq_normalize(s: str):
-    # replace chinese numerals with arabic and simple roman numerals
-    def _rep_cn(m):
-        v = chinese_numeral_to_int(m.group(0))
-        return str(v) if v is not None else m.group(0)
+@functools.lru_cache(maxsize=4096)
+def seq_token_mask(s: str) -> int:
+    # bit v set iff sequence token v occurs; set equality/intersection in
+    # the tie-break collapse to integer == and & with no allocation
+    m = 0
+    for t in extract_seq_tokens(s):
+        m |= 1 << int(t)
+    return m
 
-    s = re.sub(r"[一二两三四五六七八九十]{1,3}", _rep_cn, s)
 
-    def _rep_rom(m):
-        v = roman_to_int(m.group(0))
+def seq_normalize(s: str) -> str:
+    # replace chinese and simple roman numerals with arabic in one pass
+    def _rep(m):
+        v = _seq_token_to_int(m)
         return str(v) if v is not None else m.group(0)
 
-    s = re.sub(r"\b(?:I|II|III|IV|V|VI|VII|VIII|IX|X)\b", _rep_rom, s, flags=re.I)
-    return s
+    return _SEQ_RE.sub(_rep, s)